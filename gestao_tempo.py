@@ -12,9 +12,15 @@ Gestão de Tempo - Tkinter
 
 import os
 import sys
+import queue
 import sqlite3
+import threading
+import time
+import functools
+import importlib.util
 import datetime as dt
-from typing import Optional, List, Tuple
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional, List, Tuple
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
@@ -48,14 +54,18 @@ try:
 except ImportError:
     winsound = None
 
+_HAS_WINSOUND = winsound is not None
+
+# o arquivo não muda durante a execução: verifica uma vez só
+_ALERT_PATH = os.path.join(APP_DIR, "alert.wav")
+_ALERT_EXISTS = os.path.exists(_ALERT_PATH)
+
 
 def play_alert_sound():
     """
     Toca o arquivo alert.wav na pasta da aplicação (APP_DIR).
     Se não encontrar ou der erro, usa o beep padrão (bell).
     """
-    sound_path = os.path.join(APP_DIR, "alert.wav")
-
     # fallback: função para dar um "beep" simples
     def fallback_beep():
         root = tk._default_root
@@ -65,53 +75,180 @@ def play_alert_sound():
             except Exception:
                 pass
 
-    if not os.path.exists(sound_path):
+    if not _ALERT_EXISTS:
         fallback_beep()
         return
 
     try:
-        if winsound is not None:
-            winsound.PlaySound(sound_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+        if _HAS_WINSOUND:
+            winsound.PlaySound(_ALERT_PATH, winsound.SND_FILENAME | winsound.SND_ASYNC)
         else:
             # Sem winsound (Linux/Mac) -> tenta bell
             fallback_beep()
     except Exception:
         fallback_beep()
 
-try:
-    from tkcalendar import Calendar
-    TKCALENDAR_AVAILABLE = True
-except Exception:
-    TKCALENDAR_AVAILABLE = False
 
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib import colors
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    REPORTLAB_AVAILABLE = True
-except Exception:
-    REPORTLAB_AVAILABLE = False
+def _play_alert_file():
+    """Toca alert.wav pelo winsound; feita para rodar fora da thread do Tk."""
+    try:
+        winsound.PlaySound(_ALERT_PATH, winsound.SND_FILENAME)
+    except Exception:
+        pass
 
-try:
+# Só verifica se os pacotes existem; os imports em si ficam para o primeiro
+# uso (agenda, PDF, dashboard), para não pesar na inicialização.
+TKCALENDAR_AVAILABLE = importlib.util.find_spec("tkcalendar") is not None
+REPORTLAB_AVAILABLE = importlib.util.find_spec("reportlab") is not None
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec("matplotlib") is not None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_matplotlib_tk():
+    """
+    Importa o matplotlib com backend TkAgg na primeira abertura do dashboard
+    e guarda (FigureCanvasTkAgg, numpy) para as próximas.
+    """
     import matplotlib
     matplotlib.use("TkAgg")
     from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    from matplotlib.figure import Figure
-    MATPLOTLIB_AVAILABLE = True
-except Exception:
-    MATPLOTLIB_AVAILABLE = False
+    import numpy as np  # dependência do próprio matplotlib
+    return FigureCanvasTkAgg, np
 
 
 # ==============================
 # Camada de dados
 # ==============================
 
+_EPOCH = dt.datetime(1970, 1, 1)
+
+# INSERT ... RETURNING existe a partir do SQLite 3.35; em versões antigas o
+# insert não devolve linhas e o id é buscado com um SELECT.
+_RETURNING_ID = " RETURNING id" if sqlite3.sqlite_version_info >= (3, 35, 0) else ""
+
+
+def _next_day_iso(day_iso: str) -> str:
+    """Dia seguinte (YYYY-MM-DD), usado como limite exclusivo nos filtros."""
+    return (dt.date.fromisoformat(day_iso) + dt.timedelta(days=1)).isoformat()
+
+
+def _to_epoch(iso: str) -> int:
+    """
+    Segundos desde 1970-01-01 do horário *local* gravado em start_time
+    (sem fuso, igual ao strftime('%s', ...) do SQLite usado na migração).
+    """
+    return int((dt.datetime.fromisoformat(iso) - _EPOCH).total_seconds())
+
+
+def _epoch_range(start_day: str, end_day: str) -> Tuple[int, int]:
+    """Limites [início, fim) em epoch para os dias start_day..end_day."""
+    return _to_epoch(start_day), _to_epoch(_next_day_iso(end_day))
+
+
+def _memoize_period(method):
+    """
+    Guarda em self._cache o resultado de uma consulta por dia (day_iso) ou
+    por período (start_iso, end_iso), com a chave (método, args).
+
+    Gravar um log invalida só as entradas cujo período contém o dia gravado
+    (invalidate_days); as demais escritas limpam tudo (clear_cache). Como
+    outra conexão (DBWorker) também pode escrever, cada entrada vale no
+    máximo Database.CACHE_TTL segundos.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        key = (method.__name__,) + args
+        entry = self._cache.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < self.CACHE_TTL:
+            return entry[3]
+        result = method(self, *args)
+        self._cache[key] = (now, args[0], args[-1], result)
+        return result
+    return wrapper
+
+
+# SQL dos comandos mais frequentes, compartilhado entre os métodos para
+# reaproveitar o mesmo statement preparado
+_SQL_ADD_PROJECT = "INSERT OR IGNORE INTO projects (name) VALUES (?)" + _RETURNING_ID
+
+_SQL_ADD_SUBJECT = (
+    "INSERT OR IGNORE INTO subjects (project_id, name) VALUES (?, ?)" + _RETURNING_ID
+)
+
+_SQL_ADD_LOG = """
+    INSERT INTO logs
+        (project_id, subject_id, start_time, end_time, duration, start_epoch)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# linhas já no formato das tabelas de logs (id, projeto, matéria, início,
+# fim, minutos), para serem exibidas sem reempacotar
+_SQL_LOGS_SELECT = """
+    SELECT
+        l.id,
+        COALESCE(p.name, '-') AS project_name,
+        COALESCE(s.name, '-') AS subject_name,
+        l.start_time,
+        l.end_time,
+        (l.duration + 30) / 60 AS minutes
+    FROM logs l
+    LEFT JOIN projects p ON p.id = l.project_id
+    LEFT JOIN subjects s ON s.id = l.subject_id
+"""
+
+_SQL_LOGS_BETWEEN = _SQL_LOGS_SELECT + """
+    WHERE l.start_epoch >= ? AND l.start_epoch < ?
+    ORDER BY l.start_epoch
+"""
+
+_SQL_LOGS_BETWEEN_SINCE = _SQL_LOGS_SELECT + """
+    WHERE l.start_epoch >= ? AND l.start_epoch < ? AND l.id > ?
+    ORDER BY l.start_epoch
+"""
+
+
 class Database:
+    # conexão única da aplicação (ver instance())
+    _inst: Optional["Database"] = None
+    # validade, em segundos, das consultas guardadas (ver _memoize_period)
+    CACHE_TTL = 5.0
+
+    @classmethod
+    def instance(cls) -> "Database":
+        """
+        Devolve a conexão compartilhada com DB_FILE, abrindo-a no primeiro uso,
+        para que todas as janelas reaproveitem o mesmo cache de páginas e de
+        statements.
+        """
+        if cls._inst is None:
+            cls._inst = cls(DB_FILE)
+        return cls._inst
+
     def __init__(self, dbfile: str = DB_FILE) -> None:
         self.dbfile = dbfile
-        self.conn = sqlite3.connect(self.dbfile, detect_types=sqlite3.PARSE_DECLTYPES)
-        self.conn.execute("PRAGMA foreign_keys = ON;")
+        self.conn = sqlite3.connect(
+            self.dbfile,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            cached_statements=256,
+        )
+        # um cursor por texto de SQL (ver _exec)
+        self._stmt_cache: Dict[str, sqlite3.Cursor] = {}
+        # consultas por dia/período já feitas (ver _memoize_period)
+        self._cache: Dict[tuple, tuple] = {}
+        # WAL + synchronous=NORMAL: cada commit vira um append no journal em vez
+        # de um fsync completo. Obs.: o WAL cria os arquivos auxiliares
+        # pomodoro_study.db-wal e pomodoro_study.db-shm na mesma pasta do banco.
+        self.conn.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -20000;
+            PRAGMA mmap_size = 134217728;
+            PRAGMA foreign_keys = ON;
+            """
+        )
         self.create_tables()
 
     def create_tables(self) -> None:
@@ -147,70 +284,136 @@ class Database:
                 start_time TEXT NOT NULL,
                 end_time   TEXT NOT NULL,
                 duration   INTEGER NOT NULL,
+                start_epoch INTEGER,
                 FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
                 FOREIGN KEY (subject_id) REFERENCES subjects(id) ON DELETE CASCADE
             );
             """
         )
+        # migração: bancos antigos não têm start_epoch
+        cols = {row[1] for row in cur.execute("PRAGMA table_info(logs)")}
+        if "start_epoch" not in cols:
+            cur.execute("ALTER TABLE logs ADD COLUMN start_epoch INTEGER")
+            cur.execute(
+                "UPDATE logs SET start_epoch = CAST(strftime('%s', start_time) AS INTEGER) "
+                "WHERE start_epoch IS NULL"
+            )
+        # índice de cobertura para os filtros por dia/período: os resumos
+        # (SUM(duration) por projeto/matéria) saem do índice, sem ler a tabela;
+        # substitui o antigo idx_logs_start_epoch, que era prefixo deste, e o
+        # idx_logs_start (start_time), que nenhuma consulta usa mais
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_logs_day "
+            "ON logs(start_epoch, project_id, subject_id, duration);"
+        )
+        cur.execute("DROP INDEX IF EXISTS idx_logs_start_epoch;")
+        cur.execute("DROP INDEX IF EXISTS idx_logs_start;")
+        # usados pelas exclusões em cascata (ON DELETE CASCADE) de matéria/projeto
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_logs_subject_start "
+            "ON logs(subject_id, start_time);"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_logs_project_start "
+            "ON logs(project_id, start_time);"
+        )
         self.conn.commit()
 
     def close(self) -> None:
         if self.conn:
+            for cur in self._stmt_cache.values():
+                cur.close()
+            self._stmt_cache.clear()
             self.conn.close()
             self.conn = None
+        if Database._inst is self:
+            Database._inst = None
+
+    def clear_cache(self) -> None:
+        """Descarta todas as consultas guardadas."""
+        self._cache.clear()
+
+    def invalidate_days(self, days) -> None:
+        """Descarta as consultas guardadas cujo período contém algum dos dias."""
+        days = set(days)
+        stale = [
+            key
+            for key, (_, start, end, _) in self._cache.items()
+            if any(start <= day <= end for day in days)
+        ]
+        for key in stale:
+            del self._cache[key]
+
+    def _exec(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """
+        Executa o SQL reaproveitando um cursor por texto de comando, para que
+        o statement já preparado seja reutilizado entre chamadas.
+        """
+        cur = self._stmt_cache.get(sql)
+        if cur is None:
+            cur = self._stmt_cache[sql] = self.conn.cursor()
+        cur.execute(sql, params)
+        return cur
 
     # ------------- projetos -------------
     def add_project(self, name: str) -> int:
         name = name.strip()
         if not name:
             raise ValueError("Nome do projeto vazio.")
-        cur = self.conn.cursor()
-        cur.execute("INSERT OR IGNORE INTO projects (name) VALUES (?)", (name,))
-        self.conn.commit()
-        cur.execute("SELECT id FROM projects WHERE name = ?", (name,))
-        row = cur.fetchone()
-        return row[0]
+        with self.conn:
+            rows = self._exec(_SQL_ADD_PROJECT, (name,)).fetchall()
+        self.clear_cache()
+        if not rows:  # já existia (IGNORE)
+            rows = self._exec("SELECT id FROM projects WHERE name = ?", (name,)).fetchall()
+        return rows[0][0]
 
     def get_projects(self) -> List[Tuple[int, str]]:
-        cur = self.conn.cursor()
-        cur.execute("SELECT id, name FROM projects ORDER BY name")
-        return cur.fetchall()
+        return self._exec("SELECT id, name FROM projects ORDER BY name").fetchall()
+
+    def get_projects_with_subjects(self) -> List[Tuple[int, str, Optional[int], Optional[str]]]:
+        """
+        (project_id, projeto, subject_id, matéria) de todos os projetos, em uma
+        consulta só; projetos sem matérias vêm com subject_id/matéria None.
+        """
+        return self._exec(
+            """
+            SELECT p.id, p.name, s.id, s.name
+            FROM projects p
+            LEFT JOIN subjects s ON s.project_id = p.id
+            ORDER BY p.name, s.name
+            """
+        ).fetchall()
 
     def delete_project(self, project_id: int) -> None:
-        cur = self.conn.cursor()
-        cur.execute("DELETE FROM projects WHERE id = ?", (project_id,))
-        self.conn.commit()
+        with self.conn:
+            self._exec("DELETE FROM projects WHERE id = ?", (project_id,))
+        self.clear_cache()
 
     # ------------- matérias -------------
     def add_subject(self, project_id: int, name: str) -> int:
         name = name.strip()
         if not name:
             raise ValueError("Nome da matéria vazio.")
-        cur = self.conn.cursor()
-        cur.execute(
-            "INSERT OR IGNORE INTO subjects (project_id, name) VALUES (?, ?)",
-            (project_id, name),
-        )
-        self.conn.commit()
-        cur.execute(
-            "SELECT id FROM subjects WHERE project_id = ? AND name = ?",
-            (project_id, name),
-        )
-        row = cur.fetchone()
-        return row[0]
+        with self.conn:
+            rows = self._exec(_SQL_ADD_SUBJECT, (project_id, name)).fetchall()
+        self.clear_cache()
+        if not rows:  # já existia (IGNORE)
+            rows = self._exec(
+                "SELECT id FROM subjects WHERE project_id = ? AND name = ?",
+                (project_id, name),
+            ).fetchall()
+        return rows[0][0]
 
     def get_subjects(self, project_id: int) -> List[Tuple[int, str]]:
-        cur = self.conn.cursor()
-        cur.execute(
+        return self._exec(
             "SELECT id, name FROM subjects WHERE project_id = ? ORDER BY name",
             (project_id,),
-        )
-        return cur.fetchall()
+        ).fetchall()
 
     def delete_subject(self, subject_id: int) -> None:
-        cur = self.conn.cursor()
-        cur.execute("DELETE FROM subjects WHERE id = ?", (subject_id,))
-        self.conn.commit()
+        with self.conn:
+            self._exec("DELETE FROM subjects WHERE id = ?", (subject_id,))
+        self.clear_cache()
 
     # ------------- logs -------------
     def add_log(
@@ -221,104 +424,240 @@ class Database:
         end_iso: str,
         duration_seconds: int,
     ) -> int:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO logs (project_id, subject_id, start_time, end_time, duration)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (project_id, subject_id, start_iso, end_iso, duration_seconds),
-        )
-        self.conn.commit()
+        with self.conn:
+            cur = self._exec(
+                _SQL_ADD_LOG,
+                (
+                    project_id,
+                    subject_id,
+                    start_iso,
+                    end_iso,
+                    duration_seconds,
+                    _to_epoch(start_iso),
+                ),
+            )
+        self.invalidate_days([start_iso[:10]])
         return cur.lastrowid
 
-    def get_logs_day(self, day_iso: str) -> List[Tuple]:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            SELECT
-                l.id,
-                p.name AS project_name,
-                s.name AS subject_name,
-                l.start_time,
-                l.end_time,
-                l.duration
-            FROM logs l
-            LEFT JOIN projects p ON p.id = l.project_id
-            LEFT JOIN subjects s ON s.id = l.subject_id
-            WHERE DATE(l.start_time) = ?
-            ORDER BY l.start_time
-            """,
-            (day_iso,),
-        )
-        return cur.fetchall()
+    def add_logs_bulk(
+        self, rows: List[Tuple[int, int, str, str, int]]
+    ) -> List[Optional[int]]:
+        """
+        Insere vários logs (project_id, subject_id, início, fim, duração)
+        em uma única transação e devolve os ids gerados, na mesma ordem.
+        Se algum log viola uma restrição (projeto/matéria já excluídos), o lote
+        é desfeito e gravado por add_logs_each: esse log fica com id None.
+        """
+        if not rows:
+            return []
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    _SQL_ADD_LOG,
+                    [row + (_to_epoch(row[2]),) for row in rows],
+                )
+                # dentro da mesma transação os ids do AUTOINCREMENT são consecutivos
+                last_id = self._exec("SELECT last_insert_rowid()").fetchone()[0]
+        except sqlite3.IntegrityError:
+            return self.add_logs_each(rows)
+        self.invalidate_days(row[2][:10] for row in rows)
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    def add_logs_each(self, rows: List[Tuple[int, int, str, str, int]]) -> List[Optional[int]]:
+        """
+        Como add_logs_bulk, mas uma transação por log: um log que falha (por
+        exemplo, projeto/matéria já excluídos) fica com id None sem desfazer
+        os demais.
+        """
+        ids: List[Optional[int]] = []
+        for row in rows:
+            try:
+                ids.append(self.add_log(*row))
+            except sqlite3.Error:
+                ids.append(None)
+        return ids
 
+    @_memoize_period
+    def get_logs_day(self, day_iso: str) -> List[Tuple]:
+        """(id, projeto, matéria, início, fim, minutos) dos logs do dia."""
+        return self._exec(
+            _SQL_LOGS_BETWEEN,
+            _epoch_range(day_iso, day_iso),
+        ).fetchall()
+
+    def get_logs_day_since(self, day_iso: str, min_id: int) -> List[Tuple]:
+        """Como get_logs_day, mas só os logs com id > min_id."""
+        return self._exec(
+            _SQL_LOGS_BETWEEN_SINCE,
+            _epoch_range(day_iso, day_iso) + (min_id,),
+        ).fetchall()
+
+    @_memoize_period
     def get_logs_range(self, start_iso: str, end_iso: str) -> List[Tuple]:
-        cur = self.conn.cursor()
-        cur.execute(
+        return self._exec(
+            _SQL_LOGS_BETWEEN,
+            _epoch_range(start_iso, end_iso),
+        ).fetchall()
+
+    @_memoize_period
+    def get_day_total(self, day_iso: str) -> int:
+        """Total de segundos registrados no dia (só pelo índice idx_logs_day)."""
+        return self._exec(
             """
-            SELECT
-                l.id,
-                p.name AS project_name,
-                s.name AS subject_name,
-                l.start_time,
-                l.end_time,
-                l.duration
-            FROM logs l
-            LEFT JOIN projects p ON p.id = l.project_id
-            LEFT JOIN subjects s ON s.id = l.subject_id
-            WHERE DATE(l.start_time) BETWEEN DATE(?) AND DATE(?)
-            ORDER BY l.start_time
+            SELECT COALESCE(SUM(duration), 0)
+            FROM logs
+            WHERE start_epoch >= ? AND start_epoch < ?
             """,
-            (start_iso, end_iso),
-        )
-        return cur.fetchall()
+            _epoch_range(day_iso, day_iso),
+        ).fetchone()[0]
 
+    @_memoize_period
     def summary_by_subject_day(self, day_iso: str) -> List[Tuple[str, int]]:
-        cur = self.conn.cursor()
-        cur.execute(
+        return self._exec(
             """
             SELECT s.name, SUM(l.duration) AS total_sec
             FROM logs l
             LEFT JOIN subjects s ON s.id = l.subject_id
-            WHERE DATE(l.start_time) = ?
+            WHERE l.start_epoch >= ? AND l.start_epoch < ?
             GROUP BY s.name
             ORDER BY total_sec DESC
             """,
-            (day_iso,),
-        )
-        return cur.fetchall()
+            _epoch_range(day_iso, day_iso),
+        ).fetchall()
 
+    @_memoize_period
     def summary_by_subject_range(
         self, start_iso: str, end_iso: str
-    ) -> List[Tuple[str, int]]:
-        cur = self.conn.cursor()
-        cur.execute(
+    ) -> List[Tuple[str, int, str, int]]:
+        """(nome, total_sec, rótulo truncado p/ gráfico, minutos) por matéria."""
+        return self._exec(
             """
-            SELECT s.name, SUM(l.duration) AS total_sec
+            SELECT
+                s.name,
+                SUM(l.duration) AS total_sec,
+                CASE WHEN length(s.name) <= 20 THEN s.name
+                     ELSE substr(s.name, 1, 17) || '...' END AS label,
+                (SUM(l.duration) + 30) / 60 AS minutes
             FROM logs l
             LEFT JOIN subjects s ON s.id = l.subject_id
-            WHERE DATE(l.start_time) BETWEEN DATE(?) AND DATE(?)
+            WHERE l.start_epoch >= ? AND l.start_epoch < ?
             GROUP BY s.name
             ORDER BY total_sec DESC
             """,
-            (start_iso, end_iso),
-        )
-        return cur.fetchall()
+            _epoch_range(start_iso, end_iso),
+        ).fetchall()
 
-    def summary_by_day(self, start_iso: str, end_iso: str) -> List[Tuple[str, int]]:
-        cur = self.conn.cursor()
-        cur.execute(
+    @_memoize_period
+    def summary_by_day(
+        self, start_iso: str, end_iso: str
+    ) -> List[Tuple[str, int, int]]:
+        """
+        (dia, total_sec, minutos) por dia do período. O dia sai de start_epoch
+        (horário local em segundos), então a consulta é respondida só pelo
+        índice idx_logs_day, sem ler a tabela logs.
+        """
+        return self._exec(
             """
-            SELECT DATE(start_time) AS dia, SUM(duration) AS total_sec
+            SELECT
+                date(start_epoch, 'unixepoch') AS dia,
+                SUM(duration) AS total_sec,
+                (SUM(duration) + 30) / 60 AS minutes
             FROM logs
-            WHERE DATE(start_time) BETWEEN DATE(?) AND DATE(?)
-            GROUP BY DATE(start_time)
-            ORDER BY DATE(start_time)
+            WHERE start_epoch >= ? AND start_epoch < ?
+            GROUP BY dia
+            ORDER BY dia
             """,
-            (start_iso, end_iso),
-        )
-        return cur.fetchall()
+            _epoch_range(start_iso, end_iso),
+        ).fetchall()
+
+
+class DBWorker(threading.Thread):
+    """
+    Thread que executa métodos de Database fora do loop do Tk.
+
+    A conexão é própria da thread e criada dentro de run() (o sqlite3 não
+    deixa usar uma conexão em outra thread); com WAL ela convive com a
+    conexão principal. A thread nunca chama o Tk: os resultados ficam em
+    uma fila e deliver(), chamado pela janela, executa os callbacks.
+
+    Se a conexão da thread não puder ser aberta, o erro fica em self.error
+    (e é entregue uma vez por deliver()); os jobs ainda não executados podem
+    ser retirados com take_unrun() e executados em outra conexão.
+    """
+
+    def __init__(self, dbfile: str) -> None:
+        super().__init__(name="DBWorker", daemon=True)
+        self.dbfile = dbfile
+        self._tx: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._rx: "queue.Queue[tuple]" = queue.Queue()
+        self.pending = 0  # jobs enviados cujo resultado ainda não foi entregue
+        self.error: Optional[Exception] = None  # falha ao abrir a conexão
+
+    def submit(self, method: str, args: tuple = (), callback=None, errback=None) -> None:
+        """
+        Agenda Database.<method>(*args); callback(resultado), ou errback(erro)
+        se o método falhar, roda em deliver().
+        """
+        self.pending += 1
+        self._tx.put((method, args, callback, errback))
+
+    def take_unrun(self) -> List[tuple]:
+        """Retira da fila os jobs (method, args, callback, errback) não executados."""
+        jobs = []
+        while True:
+            try:
+                job = self._tx.get_nowait()
+            except queue.Empty:
+                return jobs
+            if job is not None:
+                self.pending -= 1
+                jobs.append(job)
+
+    def stop(self) -> None:
+        """Encerra a thread depois dos jobs já enviados."""
+        self._tx.put(None)
+
+    def run(self) -> None:
+        try:
+            db = Database(self.dbfile)
+        except Exception as e:
+            # job None: erro da própria thread, não de um job enviado
+            self.error = e
+            self._rx.put((None, None, e))
+            return
+        try:
+            while True:
+                job = self._tx.get()
+                if job is None:
+                    break
+                method, args = job[:2]
+                try:
+                    self._rx.put((job, getattr(db, method)(*args), None))
+                except Exception as e:
+                    self._rx.put((job, None, e))
+        finally:
+            db.close()
+
+    def deliver(self, on_error) -> None:
+        """
+        Executa, na thread que chamar, os callbacks dos jobs concluídos. Um
+        job que falhou vai para o seu errback ou, sem errback, para
+        on_error(erro), assim como a falha ao abrir a conexão.
+        """
+        while True:
+            try:
+                job, result, exc = self._rx.get_nowait()
+            except queue.Empty:
+                return
+            if job is None:
+                on_error(exc)
+                continue
+            self.pending -= 1
+            _method, _args, callback, errback = job
+            if exc is not None:
+                (errback or on_error)(exc)
+            elif callback is not None:
+                callback(result)
 
 
 # ==============================
@@ -335,6 +674,10 @@ class ManagerWindow(tk.Toplevel):
         self.grab_set()
         self.protocol("WM_DELETE_WINDOW", self._handle_close)
 
+        # ids na mesma ordem das linhas de cada Listbox
+        self._project_ids: List[int] = []
+        self._subject_ids: List[int] = []
+
         self._build_ui()
         self._load_projects()
 
@@ -345,7 +688,11 @@ class ManagerWindow(tk.Toplevel):
         # Projetos
         proj_frame = ttk.LabelFrame(main, text="Projetos")
         proj_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 5), pady=(0, 5))
-        self.lb_projects = tk.Listbox(proj_frame, height=8, width=30)
+        # exportselection=False: selecionar uma matéria não pode limpar a
+        # seleção do projeto (o que recarregaria a lista de matérias)
+        self.lb_projects = tk.Listbox(
+            proj_frame, height=8, width=30, exportselection=False
+        )
         self.lb_projects.grid(row=0, column=0, columnspan=2, padx=5, pady=5)
 
         ttk.Label(proj_frame, text="Novo projeto:").grid(
@@ -363,7 +710,9 @@ class ManagerWindow(tk.Toplevel):
         # Matérias
         subj_frame = ttk.LabelFrame(main, text="Matérias do projeto selecionado")
         subj_frame.grid(row=0, column=1, sticky="nsew", padx=(5, 0), pady=(0, 5))
-        self.lb_subjects = tk.Listbox(subj_frame, height=8, width=30)
+        self.lb_subjects = tk.Listbox(
+            subj_frame, height=8, width=30, exportselection=False
+        )
         self.lb_subjects.grid(row=0, column=0, columnspan=2, padx=5, pady=5)
 
         ttk.Label(subj_frame, text="Nova matéria:").grid(
@@ -386,44 +735,29 @@ class ManagerWindow(tk.Toplevel):
         self.destroy()
 
     def _load_projects(self):
+        projects = self.db.get_projects()
+        self._project_ids = [pid for pid, _ in projects]
         self.lb_projects.delete(0, tk.END)
-        for pid, name in self.db.get_projects():
-            self.lb_projects.insert(tk.END, f"{name} (id={pid})")
+        self.lb_projects.insert(tk.END, *[name for _, name in projects])
         self._load_subjects()
 
     def _get_selected_project_id(self) -> Optional[int]:
         sel = self.lb_projects.curselection()
-        if not sel:
-            return None
-        text = self.lb_projects.get(sel[0])
-        if "(id=" in text:
-            try:
-                pid = int(text.split("(id=")[1].split(")")[0])
-                return pid
-            except Exception:
-                return None
-        return None
+        return self._project_ids[sel[0]] if sel else None
 
     def _get_selected_subject_id(self) -> Optional[int]:
         sel = self.lb_subjects.curselection()
-        if not sel:
-            return None
-        text = self.lb_subjects.get(sel[0])
-        if "(id=" in text:
-            try:
-                sid = int(text.split("(id=")[1].split(")")[0])
-                return sid
-            except Exception:
-                return None
-        return None
+        return self._subject_ids[sel[0]] if sel else None
 
     def _load_subjects(self):
         self.lb_subjects.delete(0, tk.END)
+        self._subject_ids = []
         project_id = self._get_selected_project_id()
         if project_id is None:
             return
-        for sid, name in self.db.get_subjects(project_id):
-            self.lb_subjects.insert(tk.END, f"{name} (id={sid})")
+        subjects = self.db.get_subjects(project_id)
+        self._subject_ids = [sid for sid, _ in subjects]
+        self.lb_subjects.insert(tk.END, *[name for _, name in subjects])
 
     def _add_project(self):
         name = self.ent_project.get().strip()
@@ -431,9 +765,12 @@ class ManagerWindow(tk.Toplevel):
             messagebox.showwarning("Aviso", "Informe um nome de projeto.")
             return
         try:
-            self.db.add_project(name)
+            new_id = self.db.add_project(name)
             self.ent_project.delete(0, tk.END)
-            self._load_projects()
+            # acrescenta só a nova linha (INSERT OR IGNORE pode devolver um id já listado)
+            if new_id not in self._project_ids:
+                self._project_ids.append(new_id)
+                self.lb_projects.insert(tk.END, name)
         except Exception as e:
             messagebox.showerror("Erro", f"Não foi possível adicionar o projeto:\n{e}")
 
@@ -460,9 +797,11 @@ class ManagerWindow(tk.Toplevel):
             messagebox.showwarning("Aviso", "Informe o nome da matéria.")
             return
         try:
-            self.db.add_subject(project_id, name)
+            new_id = self.db.add_subject(project_id, name)
             self.ent_subject.delete(0, tk.END)
-            self._load_subjects()
+            if new_id not in self._subject_ids:
+                self._subject_ids.append(new_id)
+                self.lb_subjects.insert(tk.END, name)
         except Exception as e:
             messagebox.showerror(
                 "Erro", f"Não foi possível adicionar a matéria:\n{e}"
@@ -473,11 +812,13 @@ class ManagerWindow(tk.Toplevel):
         if subject_id is None:
             messagebox.showwarning("Aviso", "Selecione uma matéria.")
             return
-        if messagebox.f(
+        if messagebox.askyesno(
             "Confirmar", "Excluir a matéria selecionada (e seus logs)?"
         ):
             self.db.delete_subject(subject_id)
-            self._load_subjects()
+            idx = self.lb_subjects.curselection()[0]
+            self.lb_subjects.delete(idx)
+            del self._subject_ids[idx]
 
 
 class DailyDetailsWindow(tk.Toplevel):
@@ -496,29 +837,17 @@ class DailyDetailsWindow(tk.Toplevel):
         main.pack(fill="both", expand=True)
 
         cols = ("id", "projeto", "matéria", "início", "fim", "duração_min")
-        self.tv = ttk.Treeview(main, columns=cols, show="headings")
-        for col in cols:
+        self.tv = ttk.Treeview(main, columns=cols, show="headings", selectmode="browse")
+        layout = [(40, "e"), (120, "w"), (120, "w"), (130, "w"), (130, "w"), (90, "e")]
+        for col, (width, anchor) in zip(cols, layout):
             self.tv.heading(col, text=col.capitalize())
-        self.tv.column("id", width=40, anchor="e")
-        self.tv.column("projeto", width=120)
-        self.tv.column("matéria", width=120)
-        self.tv.column("início", width=130)
-        self.tv.column("fim", width=130)
-        self.tv.column("duração_min", width=90, anchor="e")
+            self.tv.column(col, width=width, anchor=anchor, stretch=False)
         self.tv.pack(fill="both", expand=True)
 
     def _load_data(self):
-        for it in self.tv.get_children():
-            self.tv.delete(it)
-        logs = self.db.get_logs_day(self.day_iso)
-        for log in logs:
-            lid, proj, subj, start_iso, end_iso, dur_sec = log
-            mins = int(round(dur_sec / 60))
-            self.tv.insert(
-                "",
-                "end",
-                values=(lid, proj or "-", subj or "-", start_iso, end_iso, mins)
-            )
+        self.tv.delete(*self.tv.get_children())
+        for row in self.db.get_logs_day(self.day_iso):
+            self.tv.insert("", "end", values=row)
 
 
 class WeekAgendaWindow(tk.Toplevel):
@@ -542,6 +871,8 @@ class WeekAgendaWindow(tk.Toplevel):
             ).pack()
             return
 
+        from tkcalendar import Calendar
+
         today = dt.date.today()
 
         self.cal = Calendar(
@@ -582,6 +913,11 @@ class WeekAgendaWindow(tk.Toplevel):
 
 
 class DashboardWindow(tk.Toplevel):
+    # Figures reaproveitadas entre aberturas do dashboard (criar uma Figure
+    # do matplotlib é caro); só o canvas Tk é recriado em cada janela.
+    _fig_subj = None
+    _fig_day = None
+
     def __init__(self, master, db: Database, start_iso: str, end_iso: str):
         super().__init__(master)
         self.db = db
@@ -594,6 +930,24 @@ class DashboardWindow(tk.Toplevel):
 
         self._build_ui()
 
+    @classmethod
+    def _get_figure(cls, attr: str):
+        """
+        Devolve a Figure compartilhada (criada no primeiro uso) com o eixo limpo
+        e o tamanho inicial; o canvas da janela anterior pode tê-la
+        redimensionado.
+        """
+        fig = getattr(cls, attr)
+        if fig is None:
+            from matplotlib.figure import Figure
+            fig = Figure(figsize=(6, 4))
+            fig.add_subplot(111)
+            setattr(cls, attr, fig)
+        else:
+            fig.set_size_inches(6, 4)
+        fig.axes[0].clear()
+        return fig
+
     def _build_ui(self):
         main = ttk.Frame(self, padding=10)
         main.pack(fill="both", expand=True)
@@ -606,6 +960,8 @@ class DashboardWindow(tk.Toplevel):
             ).pack()
             return
 
+        FigureCanvasTkAgg, np = _load_matplotlib_tk()
+
         # Notebook com 2 abas: por matéria e por dia
         nb = ttk.Notebook(main)
         nb.pack(fill="both", expand=True)
@@ -618,15 +974,19 @@ class DashboardWindow(tk.Toplevel):
         # Dados
         subj_data = self.db.summary_by_subject_range(
             self.start_iso, self.end_iso
-        )  # (nome, total_sec)
-        day_data = self.db.summary_by_day(self.start_iso, self.end_iso)  # (dia, total_sec)
+        )  # (nome, total_sec, rótulo, minutos)
+        day_data = self.db.summary_by_day(
+            self.start_iso, self.end_iso
+        )  # (dia, total_sec, minutos)
 
         # Gráfico por matéria
         if subj_data:
-            fig1 = Figure(figsize=(6, 4))
-            ax1 = fig1.add_subplot(111)
-            labels = [name if len(name) <= 20 else name[:17] + "..." for name, _ in subj_data]
-            mins = [sec / 60 for _, sec in subj_data]
+            fig1 = self._get_figure("_fig_subj")
+            ax1 = fig1.axes[0]
+            labels = [label for _, _, label, _ in subj_data]
+            mins = np.fromiter(
+                (m for _, _, _, m in subj_data), dtype=np.int64, count=len(subj_data)
+            )
             ax1.bar(labels, mins)
             ax1.set_ylabel("Minutos")
             ax1.set_title("Tempo por matéria")
@@ -634,17 +994,19 @@ class DashboardWindow(tk.Toplevel):
             fig1.tight_layout()
 
             canvas1 = FigureCanvasTkAgg(fig1, master=frame_subj)
-            canvas1.draw()
+            canvas1.draw_idle()
             canvas1.get_tk_widget().pack(fill="both", expand=True)
         else:
             ttk.Label(frame_subj, text="Sem registros no período.").pack(pady=20)
 
         # Gráfico por dia
         if day_data:
-            fig2 = Figure(figsize=(6, 4))
-            ax2 = fig2.add_subplot(111)
-            labels = [dia for dia, _ in day_data]
-            mins = [sec / 60 for _, sec in day_data]
+            fig2 = self._get_figure("_fig_day")
+            ax2 = fig2.axes[0]
+            labels = [dia for dia, _, _ in day_data]
+            mins = np.fromiter(
+                (m for _, _, m in day_data), dtype=np.int64, count=len(day_data)
+            )
             ax2.plot(labels, mins, marker="o")
             ax2.set_ylabel("Minutos")
             ax2.set_title("Tempo por dia")
@@ -652,7 +1014,7 @@ class DashboardWindow(tk.Toplevel):
             fig2.tight_layout()
 
             canvas2 = FigureCanvasTkAgg(fig2, master=frame_day)
-            canvas2.draw()
+            canvas2.draw_idle()
             canvas2.get_tk_widget().pack(fill="both", expand=True)
         else:
             ttk.Label(frame_day, text="Sem registros no período.").pack(pady=20)
@@ -671,6 +1033,11 @@ def export_day_pdf(parent, db: Database, day_iso: str) -> None:
         )
         return
 
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
     logs = db.get_logs_day(day_iso)
     if not logs:
         messagebox.showinfo(
@@ -696,21 +1063,10 @@ def export_day_pdf(parent, db: Database, day_iso: str) -> None:
     elems.append(Spacer(1, 12))
 
     # Tabela com logs
-    data = [["ID", "Projeto", "Matéria", "Início", "Fim", "Duração (min)"]]
-    total_sec = 0
-    for lid, proj, subj, start_iso, end_iso, dur_sec in logs:
-        total_sec += dur_sec
-        mins = int(round(dur_sec / 60))
-        data.append(
-            [
-                str(lid),
-                proj or "-",
-                subj or "-",
-                start_iso,
-                end_iso,
-                str(mins),
-            ]
-        )
+    data = [["ID", "Projeto", "Matéria", "Início", "Fim", "Duração (min)"]] + [
+        [str(lid), proj, subj, start_iso, end_iso, str(mins)]
+        for lid, proj, subj, start_iso, end_iso, mins in logs
+    ]
 
     tbl = Table(data, repeatRows=1)
     tbl.setStyle(
@@ -726,7 +1082,9 @@ def export_day_pdf(parent, db: Database, day_iso: str) -> None:
     elems.append(tbl)
     elems.append(Spacer(1, 12))
 
-    total_min = int(round(total_sec / 60))
+    # total do dia somado no banco (as linhas acima só trazem minutos arredondados)
+    total_sec = db.get_day_total(day_iso)
+    total_min = (total_sec + 30) // 60
     elems.append(Paragraph(f"Total de minutos no dia: {total_min}", styles["Normal"]))
 
     doc.build(elems)
@@ -742,6 +1100,11 @@ def export_week_pdf(parent, db: Database, start_iso: str, end_iso: str) -> None:
         )
         return
 
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
     subj_data = db.summary_by_subject_range(start_iso, end_iso)
     day_data = db.summary_by_day(start_iso, end_iso)
     if not subj_data and not day_data:
@@ -772,15 +1135,14 @@ def export_week_pdf(parent, db: Database, start_iso: str, end_iso: str) -> None:
     )
     elems.append(Spacer(1, 12))
 
-    total_semana_sec = 0
+    total_semana_sec = sum(row[1] for row in subj_data)
 
     # Por matéria
     if subj_data:
         elems.append(Paragraph("Resumo por matéria", styles["Heading2"]))
-        data = [["Matéria", "Total (min)"]]
-        for name, sec in subj_data:
-            total_semana_sec += sec
-            data.append([name, str(int(round(sec / 60)))])
+        data = [["Matéria", "Total (min)"]] + [
+            [name, str(mins)] for name, _sec, _label, mins in subj_data
+        ]
         tbl = Table(data, repeatRows=1)
         tbl.setStyle(
             TableStyle(
@@ -797,9 +1159,9 @@ def export_week_pdf(parent, db: Database, start_iso: str, end_iso: str) -> None:
     # Por dia
     if day_data:
         elems.append(Paragraph("Resumo por dia", styles["Heading2"]))
-        data = [["Dia", "Total (min)"]]
-        for dia, sec in day_data:
-            data.append([dia, str(int(round(sec / 60)))])
+        data = [["Dia", "Total (min)"]] + [
+            [dia, str(mins)] for dia, _sec, mins in day_data
+        ]
         tbl = Table(data, repeatRows=1)
         tbl.setStyle(
             TableStyle(
@@ -813,7 +1175,7 @@ def export_week_pdf(parent, db: Database, start_iso: str, end_iso: str) -> None:
         elems.append(tbl)
         elems.append(Spacer(1, 12))
 
-    total_semana_min = int(round(total_semana_sec / 60))
+    total_semana_min = (total_semana_sec + 30) // 60
     elems.append(
         Paragraph(f"Total de minutos no período: {total_semana_min}", styles["Normal"])
     )
@@ -834,8 +1196,18 @@ def export_week_pdf_from_calendar(parent, db: Database, day_iso: str) -> None:
 # Aplicação principal
 # ==============================
 
+# "MM:SS" pré-formatado até 120:59 (o spinbox de trabalho vai até 120 min); o
+# timer consulta esta tabela a cada tick em vez de formatar uma string nova
+_FMT = tuple(f"{m:02d}:{s:02d}" for m in range(121) for s in range(60))
+
+
 class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tempo"
-    def __init__(self, db: Database):
+    # intervalo de gravação dos logs pendentes (ver _flush_logs)
+    LOG_FLUSH_INTERVAL_MS = 5000
+    # intervalo de leitura dos resultados do DBWorker, só enquanto há jobs
+    DB_POLL_MS = 20
+
+    def __init__(self, db: Database, initial_projects: Optional[List[Tuple]] = None):
         super().__init__()
         self.db = db
 
@@ -855,13 +1227,40 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
         self.current_start: Optional[dt.datetime] = None
         self.current_project_id: Optional[int] = None
         self.current_subject_id: Optional[int] = None
+        self.current_names: Tuple[str, str] = ("", "")  # (projeto, matéria)
 
         self.is_running = False
         self.after_id = None
+        # geração da cadeia de ticks ativa; start/pause/reset incrementam e
+        # ticks agendados por uma geração anterior são ignorados
+        self._tick_gen = 0
+        # fim da sessão em time.monotonic(); o tempo restante é derivado dele
+        self._deadline = 0.0
+        self._pause_remaining: Optional[float] = None
+        self._last_sound_ts = 0.0
+
+        # logs ainda não gravados no banco e, de cada um, a linha no resumo do
+        # dia e os valores exibidos nela (None se o log não é do dia exibido)
+        self._pending_logs: Deque[Tuple[int, int, str, str, int]] = deque()
+        self._pending_rows: Deque[Tuple[Optional[str], Optional[tuple]]] = deque()
+        self._closing = False
+
+        # o que o resumo do dia já mostra: dia, maior id e linha de cada log
+        self._today_iso = ""
+        self._today_max_log_id = 0
+        self._today_row_iids: Dict[int, str] = {}
+
+        # acesso ao banco fora da thread do Tk (registro e resumo do dia)
+        self._worker = DBWorker(db.dbfile)
+        self._worker.start()
+        self._db_poll_id = None
 
         self._build_ui()
-        self._load_projects()
+        self._load_projects(initial_projects)
 
+        self._flush_after_id = self.after(
+            self.LOG_FLUSH_INTERVAL_MS, self._flush_logs_periodic
+        )
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     # ---------- UI ----------
@@ -943,14 +1342,16 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
         timer_frame = ttk.Frame(main)
         timer_frame.grid(row=2, column=0, columnspan=2, pady=(0, 10))
 
+        self._last_label_text = self._format_time(self.remaining)
         self.time_label = ttk.Label(
             timer_frame,
-            text=self._format_time(self.remaining),
+            text=self._last_label_text,
             font=("Helvetica", 32, "bold"),
         )
         self.time_label.pack()
 
-        self.session_label = ttk.Label(timer_frame, text="Sessão: Idle")
+        self._last_session_text = "Sessão: Idle"
+        self.session_label = ttk.Label(timer_frame, text=self._last_session_text)
         self.session_label.pack()
 
         # Linha 4: botões
@@ -1007,54 +1408,80 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
 
         self.tv_today.bind("<Double-1>", lambda e: self._open_today_details())
 
-        self._refresh_today_logs()
+        # a consulta do resumo do dia fica para depois do primeiro desenho
+        self.after_idle(self._refresh_today_logs)
 
     # ---------- Utilidades ----------
     @staticmethod
     def _format_time(seconds: int) -> str:
+        if 0 <= seconds < len(_FMT):
+            return _FMT[seconds]
         m, s = divmod(seconds, 60)
         return f"{m:02d}:{s:02d}"
 
-    def _load_projects(self):
-        projects = self.db.get_projects()
-        if not projects:
+    def _load_projects(self, rows: Optional[List[Tuple]] = None):
+        """
+        Carrega projetos e matérias em uma consulta só e monta listas de ids
+        alinhadas com os valores dos comboboxes (resolvidas pelo current() de
+        cada um); trocar de projeto só lê dessas listas. Recarregado quando a
+        janela de gerenciamento é fechada. rows, se passado, é o resultado de
+        get_projects_with_subjects já lido (em main()).
+        """
+        if rows is None:
+            rows = self.db.get_projects_with_subjects()
+        if not rows:
             # garante pelo menos um projeto/matéria padrão
             pid = self.db.add_project("Default")
             self.db.add_subject(pid, "Geral")
-            projects = self.db.get_projects()
-
-        self._projects = {name: pid for pid, name in projects}
-        self.cb_project["values"] = list(self._projects.keys())
-        if projects:
+            rows = self.db.get_projects_with_subjects()
+
+        self._project_ids_list: List[int] = []
+        project_names: List[str] = []
+        self._subject_ids_by_pid: Dict[int, List[int]] = defaultdict(list)
+        self._subject_names_by_pid: Dict[int, List[str]] = defaultdict(list)
+        for pid, pname, sid, sname in rows:
+            if not self._project_ids_list or self._project_ids_list[-1] != pid:
+                self._project_ids_list.append(pid)
+                project_names.append(pname)
+            if sid is not None:
+                self._subject_ids_by_pid[pid].append(sid)
+                self._subject_names_by_pid[pid].append(sname)
+
+        self.cb_project["values"] = project_names
+        if project_names:
             self.cb_project.current(0)
             self._load_subjects()
 
     def _load_subjects(self):
-        name = self.cb_project.get()
-        project_id = self._projects.get(name)
+        idx = self.cb_project.current()
+        project_id = self._project_ids_list[idx] if idx >= 0 else None
         self.current_project_id = project_id
-        if project_id is None:
-            self.cb_subject["values"] = []
-            self.current_subject_id = None
-            return
-        subjects = self.db.get_subjects(project_id)
-        self._subjects = {name: sid for sid, name in subjects}
-        self.cb_subject["values"] = list(self._subjects.keys())
-        if subjects:
+        self._subject_ids_list = self._subject_ids_by_pid.get(project_id, [])
+        self.cb_subject["values"] = self._subject_names_by_pid.get(project_id, [])
+        if self._subject_ids_list:
             self.cb_subject.current(0)
-            self.current_subject_id = subjects[0][0]
+            self.current_subject_id = self._subject_ids_list[0]
         else:
+            self.cb_subject.set("")
             self.current_subject_id = None
 
     def _open_manager(self):
-        ManagerWindow(self, self.db, on_close=self._load_projects)
+        self._flush_logs(
+            then=lambda: ManagerWindow(self, self.db, on_close=self._on_manager_closed)
+        )
+
+    def _on_manager_closed(self):
+        self._load_projects()
+        # excluir projeto/matéria apaga os logs em cascata: refaz o resumo do dia
+        self._today_iso = ""
+        self._refresh_today_logs()
 
     def _open_today_details(self):
         today_iso = dt.date.today().isoformat()
-        DailyDetailsWindow(self, self.db, today_iso)
+        self._flush_logs(then=lambda: DailyDetailsWindow(self, self.db, today_iso))
 
     def _open_week_agenda(self):
-        WeekAgendaWindow(self, self.db)
+        self._flush_logs(then=lambda: WeekAgendaWindow(self, self.db))
 
     def _ask_range(self) -> Optional[Tuple[str, str]]:
         """Pergunta data inicial/final em um simples diálogo."""
@@ -1121,40 +1548,215 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
         if not r:
             return
         start_iso, end_iso = r
-        DashboardWindow(self, self.db, start_iso, end_iso)
+        self._flush_logs(
+            then=lambda: DashboardWindow(self, self.db, start_iso, end_iso)
+        )
 
     def _export_today_pdf(self):
         today_iso = dt.date.today().isoformat()
-        export_day_pdf(self, self.db, today_iso)
+        self._flush_logs(then=lambda: export_day_pdf(self, self.db, today_iso))
 
     def _refresh_today_logs(self):
-        for it in self.tv_today.get_children():
-            self.tv_today.delete(it)
+        """
+        Acrescenta ao resumo do dia só os logs ainda não exibidos (id maior que
+        o último mostrado). A lista é limpa apenas na virada do dia.
+        """
         today_iso = dt.date.today().isoformat()
-        logs = self.db.get_logs_day(today_iso)
-        for log in logs:
-            lid, proj, subj, start_iso, end_iso, dur_sec = log
-            mins = int(round(dur_sec / 60))
-            self.tv_today.insert(
-                "",
-                "end",
-                values=(lid, proj or "-", subj or "-", start_iso, end_iso, mins),
+        if today_iso != self._today_iso:
+            self.tv_today.delete(*self.tv_today.get_children())
+            self._today_iso = today_iso
+            self._today_max_log_id = 0
+            self._today_row_iids = {}
+        # o flush vai antes na fila do worker, então a consulta já vê os pendentes
+        self._flush_logs()
+        self._submit_db(
+            "get_logs_day_since",
+            (today_iso, self._today_max_log_id),
+            self._populate_today_tv,
+        )
+
+    def _populate_today_tv(self, logs: List[Tuple]) -> None:
+        for row in logs:
+            lid = row[0]
+            iid = self._today_row_iids.get(lid)
+            if iid is not None and self.tv_today.exists(iid):
+                self.tv_today.item(iid, values=row)
+            else:
+                self._today_row_iids[lid] = self.tv_today.insert("", "end", values=row)
+            self._today_max_log_id = max(self._today_max_log_id, lid)
+
+    def _record_log(self, end_time: dt.datetime) -> None:
+        """
+        Enfileira o log da sessão atual (gravado depois por _flush_logs) e já
+        acrescenta a linha no resumo do dia, sem consultar o banco.
+        """
+        duration = int((end_time - self.current_start).total_seconds())
+        if duration <= 0 or not self.current_project_id or not self.current_subject_id:
+            return
+        if dt.date.today().isoformat() != self._today_iso:
+            self._refresh_today_logs()  # virou o dia: recomeça a lista
+        start_iso = self.current_start.isoformat(timespec="seconds")
+        end_iso = end_time.isoformat(timespec="seconds")
+        self._pending_logs.append(
+            (self.current_project_id, self.current_subject_id, start_iso, end_iso, duration)
+        )
+        iid = values = None
+        if self.current_start.date().isoformat() == self._today_iso:
+            proj, subj = self.current_names
+            values = ("", proj, subj, start_iso, end_iso, (duration + 30) // 60)
+            iid = self.tv_today.insert("", "end", values=values)
+        self._pending_rows.append((iid, values))
+
+    def _submit_db(
+        self, method: str, args: tuple = (), callback=None, errback=None
+    ) -> None:
+        """
+        Envia uma chamada ao DBWorker e garante a leitura do resultado. Se o
+        worker não conseguiu abrir sua conexão, executa na conexão principal.
+        """
+        if self._worker.error is not None:
+            self._run_db_fallback()
+            self._run_db_sync(method, args, callback, errback)
+            return
+        self._worker.submit(method, args, callback, errback)
+        if self._db_poll_id is None:
+            self._db_poll_id = self.after(self.DB_POLL_MS, self._poll_db)
+
+    def _run_db_sync(self, method: str, args: tuple, callback, errback) -> None:
+        try:
+            result = getattr(self.db, method)(*args)
+        except Exception as e:
+            (errback or self._report_db_error)(e)
+            return
+        if callback is not None:
+            callback(result)
+
+    def _run_db_fallback(self) -> None:
+        """Entrega o erro do DBWorker e executa aqui os jobs que ele não rodou."""
+        self._worker.deliver(self._report_db_error)
+        for method, args, callback, errback in self._worker.take_unrun():
+            self._run_db_sync(method, args, callback, errback)
+
+    def _report_db_error(self, exc: Exception) -> None:
+        messagebox.showerror(
+            "Erro", f"Falha ao acessar o banco de dados:\n{exc}", parent=self
+        )
+
+    def _poll_db(self):
+        self._db_poll_id = None
+        try:
+            self._worker.deliver(self._report_db_error)
+            if self._worker.error is not None:
+                self._run_db_fallback()
+        finally:
+            if self._worker.pending and self._db_poll_id is None:
+                self._db_poll_id = self.after(self.DB_POLL_MS, self._poll_db)
+
+    def _flush_logs(self, then=None) -> None:
+        """
+        Grava os logs pendentes em uma única transação (no DBWorker), preenche
+        seus ids no resumo do dia e então chama then(), se informado.
+
+        Logs que violam uma restrição são descartados pelo próprio
+        add_logs_bulk, no mesmo job (a ordem na fila do worker é mantida); se
+        a gravação falhar por outro motivo, os logs voltam para a fila. Em
+        todos os casos then() é chamado.
+        """
+        if not self._pending_logs:
+            if then is not None:
+                then()
+            return
+        rows = list(self._pending_logs)
+        shown = list(self._pending_rows)
+        self._pending_logs.clear()
+        self._pending_rows.clear()
+
+        def on_error(exc):
+            # devolve os logs ao início da fila para a próxima tentativa
+            self._pending_logs.extendleft(reversed(rows))
+            self._pending_rows.extendleft(reversed(shown))
+            if self._closing:
+                return
+            self._report_db_error(exc)
+            if then is not None:
+                then()
+
+        self._submit_db(
+            "add_logs_bulk",
+            (rows,),
+            lambda ids: self._on_logs_flushed(rows, shown, ids, then),
+            on_error,
+        )
+
+    def _on_logs_flushed(
+        self,
+        rows: List[Tuple],
+        shown: List[Tuple[Optional[str], Optional[tuple]]],
+        ids: List[Optional[int]],
+        then,
+    ) -> None:
+        lost = 0
+        for row, (iid, values), lid in zip(rows, shown, ids):
+            exists = iid is not None and self.tv_today.exists(iid)
+            if lid is None:
+                # não gravado (projeto/matéria excluídos): tira do resumo
+                lost += 1
+                if exists:
+                    self.tv_today.delete(iid)
+                continue
+            if exists:
+                self.tv_today.set(iid, "id", lid)
+            elif values is not None and row[2][:10] == self._today_iso:
+                # a lista foi refeita antes da gravação: a linha volta com o id
+                iid = self.tv_today.insert("", "end", values=(lid,) + values[1:])
+            else:
+                continue
+            self._today_row_iids[lid] = iid
+            self._today_max_log_id = max(self._today_max_log_id, lid)
+        # a gravação foi em outra conexão: as consultas guardadas na principal caducaram
+        self.db.invalidate_days(row[2][:10] for row in rows)
+        if lost:
+            messagebox.showwarning(
+                "Aviso",
+                f"{lost} registro(s) de sessão não puderam ser gravados "
+                "(o projeto ou a matéria foi excluído).",
+                parent=self,
             )
+        if then is not None and not self._closing:
+            then()
 
-    # ---------- Timer ----------
-    def _update_session_label(self):
-        self.session_label.config(
-            text=f"Sessão: {self.session} | Ciclos concluídos: {self.completed_cycles}"
+    def _flush_logs_periodic(self):
+        self._flush_logs()
+        self._flush_after_id = self.after(
+            self.LOG_FLUSH_INTERVAL_MS, self._flush_logs_periodic
         )
 
+    # ---------- Timer ----------
+    def _session_text(self) -> str:
+        return f"Sessão: {self.session} | Ciclos concluídos: {self.completed_cycles}"
+
+    def _apply_labels(
+        self, time_text: Optional[str] = None, session_text: Optional[str] = None
+    ) -> None:
+        """
+        Atualiza os labels do timer e da sessão de uma vez; cada um só é
+        reconfigurado (e redesenhado) se o texto mudou. None mantém o atual.
+        """
+        if time_text is not None and time_text != self._last_label_text:
+            self.time_label.config(text=time_text)
+            self._last_label_text = time_text
+        if session_text is not None and session_text != self._last_session_text:
+            self.session_label.config(text=session_text)
+            self._last_session_text = session_text
+
     def start(self):
         if self.is_running:
             return
 
         # precisa de projeto/matéria
-        project_name = self.cb_project.get()
-        subject_name = self.cb_subject.get()
-        if not project_name or not subject_name:
+        project_idx = self.cb_project.current()
+        subject_idx = self.cb_subject.current()
+        if project_idx < 0 or subject_idx < 0:
             messagebox.showwarning(
                 "Seleção necessária",
                 "Selecione um projeto e uma matéria antes de iniciar.",
@@ -1162,8 +1764,9 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
             )
             return
 
-        self.current_project_id = self._projects.get(project_name)
-        self.current_subject_id = self._subjects.get(subject_name)
+        self.current_project_id = self._project_ids_list[project_idx]
+        self.current_subject_id = self._subject_ids_list[subject_idx]
+        self.current_names = (self.cb_project.get(), self.cb_subject.get())
 
         if self.session == "Idle":
             # inicia nova sessão de trabalho
@@ -1171,21 +1774,39 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
             self.remaining = self.work_minutes.get() * 60
             self.completed_cycles = 0
 
+        # retomando de uma pausa, usa o restante exato (com fração de segundo)
+        remaining = self._pause_remaining
+        if remaining is None:
+            remaining = self.remaining
+        self._pause_remaining = None
+        self._deadline = time.monotonic() + remaining
+
         self.current_start = dt.datetime.now()
         self.is_running = True
         self.btn_pause.config(state="normal")
-        self._update_session_label()
-        self._tick()
+        self._apply_labels(session_text=self._session_text())
+        self._tick_gen += 1
+        self._tick(self._tick_gen)
 
-    def _tick(self):
-        if not self.is_running:
+    def _tick(self, gen: int):
+        """
+        Atualiza o restante a partir do prazo absoluto (self._deadline), então
+        atrasos do after() não acumulam, e agenda o próximo tick para logo
+        após a próxima virada de segundo. Um tick de outra geração (agendado
+        antes de um pause/start) não faz nada.
+        """
+        if gen != self._tick_gen or not self.is_running:
             return
-        if self.remaining <= 0:
+        now = time.monotonic()
+        rem = max(0, int(round(self._deadline - now)))
+        if rem != self.remaining:
+            self.remaining = rem
+            self._apply_labels(self._format_time(rem))
+        if rem <= 0:
             self._finish_session()
             return
-        self.remaining -= 1
-        self.time_label.config(text=self._format_time(self.remaining))
-        self.after_id = self.after(1000, self._tick)
+        next_ms = int((self._deadline - now) * 1000) % 1000 + 5
+        self.after_id = self.after(next_ms, self._tick, gen)
 
     def _alert_next_session(self, title: str, message: str) -> bool:
         """
@@ -1206,8 +1827,16 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
         except Exception:
             pass
 
-        # Toca o som de alerta
-        play_alert_sound()
+        # Toca o som de alerta (no máximo um a cada 0,5 s). O PlaySound roda
+        # numa thread para não atrasar o diálogo e, nela, nunca chama o Tk;
+        # o bell de play_alert_sound fica na thread principal.
+        now = time.monotonic()
+        if now - self._last_sound_ts >= 0.5:
+            self._last_sound_ts = now
+            if _ALERT_EXISTS and _HAS_WINSOUND:
+                threading.Thread(target=_play_alert_file, daemon=True).start()
+            else:
+                play_alert_sound()
 
         # Mostra o diálogo
         try:
@@ -1229,17 +1858,8 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
 
         end_time = dt.datetime.now()
         if self.current_start and self.session == "Work":
-            duration = int((end_time - self.current_start).total_seconds())
-            if duration > 0 and self.current_project_id and self.current_subject_id:
-                self.db.add_log(
-                    self.current_project_id,
-                    self.current_subject_id,
-                    self.current_start.isoformat(timespec="seconds"),
-                    end_time.isoformat(timespec="seconds"),
-                    duration,
-                )
+            self._record_log(end_time)
         self.current_start = None
-        self._refresh_today_logs()
 
         # Decide próxima sessão
         if self.session == "Work":
@@ -1255,8 +1875,7 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
             self.session = "Work"
             self.remaining = self.work_minutes.get() * 60
 
-        self._update_session_label()
-        self.time_label.config(text=self._format_time(self.remaining))
+        self._apply_labels(self._format_time(self.remaining), self._session_text())
 
         # pergunta se quer iniciar automaticamente a próxima sessão
         if self._alert_next_session(
@@ -1269,6 +1888,10 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
         if not self.is_running:
             return
         self.is_running = False
+        self._tick_gen += 1
+        self._pause_remaining = max(0.0, self._deadline - time.monotonic())
+        self.remaining = int(round(self._pause_remaining))
+        self._apply_labels(self._format_time(self.remaining))
         if self.after_id:
             self.after_cancel(self.after_id)
             self.after_id = None
@@ -1276,30 +1899,22 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
         end_time = dt.datetime.now()
         if self.current_start and self.session == "Work":
             # registra log parcial
-            duration = int((end_time - self.current_start).total_seconds())
-            if duration > 0 and self.current_project_id and self.current_subject_id:
-                self.db.add_log(
-                    self.current_project_id,
-                    self.current_subject_id,
-                    self.current_start.isoformat(timespec="seconds"),
-                    end_time.isoformat(timespec="seconds"),
-                    duration,
-                )
+            self._record_log(end_time)
         self.current_start = None
-        self._refresh_today_logs()
         self.btn_pause.config(state="disabled")
 
     def reset_timer(self):
         self.is_running = False
+        self._tick_gen += 1
         if self.after_id:
             self.after_cancel(self.after_id)
             self.after_id = None
         self.session = "Idle"
         self.completed_cycles = 0
         self.remaining = self.work_minutes.get() * 60
+        self._pause_remaining = None
         self.current_start = None
-        self.time_label.config(text=self._format_time(self.remaining))
-        self._update_session_label()
+        self._apply_labels(self._format_time(self.remaining), self._session_text())
         self.btn_pause.config(state="disabled")
 
     def _on_close(self):
@@ -1309,6 +1924,20 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
             parent=self,
         ):
             return
+        self.after_cancel(self._flush_after_id)
+        if self._db_poll_id is not None:
+            self.after_cancel(self._db_poll_id)
+        # espera os jobs já enviados e entrega seus resultados: um lote que
+        # falhou volta para _pending_logs e é gravado abaixo, na conexão principal
+        self._closing = True
+        self._worker.stop()
+        self._worker.join(timeout=5)
+        if self._worker.error is not None:
+            self._run_db_fallback()
+        else:
+            self._worker.deliver(self._report_db_error)
+        if self._pending_logs:
+            self._run_db_sync("add_logs_bulk", (list(self._pending_logs),), None, None)
         self.db.close()
         self.destroy()
 
@@ -1318,13 +1947,16 @@ class PomodoroApp(tk.Tk):  # nome da classe mantido, mas a UI é "Gestão de Tem
 # ==============================
 
 def main():
-    db = Database(DB_FILE)
-    # garante pelo menos um projeto/matéria
-    if not db.get_projects():
+    db = Database.instance()
+    # garante pelo menos um projeto/matéria; a lista lida aqui é repassada
+    # para a janela, que não consulta o banco de novo ao abrir
+    projects = db.get_projects_with_subjects()
+    if not projects:
         pid = db.add_project("Default")
-        db.add_subject(pid, "Geral")
+        sid = db.add_subject(pid, "Geral")
+        projects = [(pid, "Default", sid, "Geral")]
 
-    app = PomodoroApp(db)
+    app = PomodoroApp(db, initial_projects=projects)
     app.mainloop()
 
 